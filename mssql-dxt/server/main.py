@@ -2,13 +2,59 @@
 
 import os
 import sys
+import io
 import json
+import uuid
+import base64
+import decimal
+import datetime
+import asyncio
+import inspect
+import functools
+import types
+import time
+import threading
+import collections
+import contextlib
+import concurrent.futures
 import pyodbc
 from mcp.server.fastmcp import FastMCP
 
+try:
+    import orjson
+except ImportError: # orjson is optional; the standard library encoder is used without it
+    orjson = None
+
+# Let the ODBC driver manager pool physical connections as well. This must be set before the
+# first pyodbc.connect call and only matches connections whose connection strings are identical.
+# It takes effect with the Windows driver manager; unixODBC and iODBC only pool connections when
+# pooling is also enabled in odbcinst.ini.
+pyodbc.pooling = True
+
 # Initialize MCP Server
 mcp = FastMCP("mssql-dxt-server")
 
+def _json_default(obj):
+    """Converts rows and column values the JSON encoders do not handle natively (DECIMAL, BINARY, dates, ...)."""
+    if isinstance(obj, pyodbc.Row):
+        return tuple(obj) # Encoded as an array; avoids copying every row into a list up front
+    if isinstance(obj, decimal.Decimal):
+        return str(obj) # Keeps full precision, unlike float
+    if isinstance(obj, (bytes, bytearray)):
+        return base64.b64encode(obj).decode("ascii")
+    if isinstance(obj, (datetime.date, datetime.time)):
+        return obj.isoformat()
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+if orjson is not None:
+    def _dumps(obj) -> str:
+        """Serializes obj to a JSON string using orjson."""
+        return orjson.dumps(obj, default=_json_default).decode()
+else:
+    _dumps = functools.partial(json.dumps, default=_json_default)
+
 # This environment variable can be used by the DXT to get its config.
 USER_CONFIG_ENV_VAR = "USER_CONFIG"
 
@@ -18,22 +64,22 @@ def _is_placeholder(value: str | None) -> bool:
         return False
     return value.startswith("${user_config.") and value.endswith("}")
 
-def _get_env_val(var_name: str) -> str | None:
-    """Gets environment variable, returning None if it's a placeholder or not set."""
-    val = os.environ.get(var_name)
+def _get_env_val(var_name: str, env=os.environ) -> str | None:
+    """Gets environment variable (from `env` if given), returning None if it's a placeholder or not set."""
+    val = env.get(var_name)
     if _is_placeholder(val):
         print(f"Info: Environment variable '{var_name}' contains placeholder, treating as not set.", file=sys.stderr)
         return None
     return val
 
-def _get_bool_env(var_name: str, default: bool) -> bool:
-    val_str = _get_env_val(var_name)
+def _get_bool_env(var_name: str, default: bool, env=os.environ) -> bool:
+    val_str = _get_env_val(var_name, env)
     if val_str is None:
         return default
     return val_str.lower() == 'true'
 
-def _get_int_env(var_name: str, default: int) -> int:
-    val_str = _get_env_val(var_name)
+def _get_int_env(var_name: str, default: int, env=os.environ) -> int:
+    val_str = _get_env_val(var_name, env)
     if val_str is None:
         return default
     try:
@@ -42,42 +88,50 @@ def _get_int_env(var_name: str, default: int) -> int:
         print(f"Warning: Could not parse environment variable {var_name} ('{val_str}') as int, using default {default}.", file=sys.stderr)
         return default
 
+CONNECTION_SLOT_COUNT = 3 # Matches the conn1..conn3 slots declared in manifest.json
+
 def load_connections_from_env():
     """Loads connection configurations from individual environment variables."""
+    # Snapshot the connection variables in one pass instead of probing os.environ for every field.
+    env = {k: v for k, v in os.environ.items() if k.startswith("APP_CONN")}
     active_connections = []
-    for i in range(1, 4):  # For conn1, conn2, conn3
+    for i in range(1, CONNECTION_SLOT_COUNT + 1):
         env_prefix = f"APP_CONN{i}_"
 
         # Special handling for enable default for conn1
-        enable_env_val = os.environ.get(f"{env_prefix}ENABLE") # Read raw value for default check
+        enable_env_val = env.get(f"{env_prefix}ENABLE") # Read raw value for default check
         if i == 1 and enable_env_val is None: # APP_CONN1_ENABLE not set at all
             is_enabled = True # Default for conn1_enable is true from manifest
         elif _is_placeholder(enable_env_val) and i == 1: # APP_CONN1_ENABLE is placeholder
              is_enabled = True # Treat placeholder as "not set by user", apply manifest default
         else: # For conn2, conn3, or if conn1_enable is explicitly set (even if placeholder for those)
-            is_enabled = _get_bool_env(f"{env_prefix}ENABLE", False) # Default for conn2/3_enable is false
+            is_enabled = _get_bool_env(f"{env_prefix}ENABLE", False, env) # Default for conn2/3_enable is false
 
         if is_enabled:
-            name = _get_env_val(f"{env_prefix}NAME")
-            server = _get_env_val(f"{env_prefix}SERVER")
-            database = _get_env_val(f"{env_prefix}DATABASE")
+            name = _get_env_val(f"{env_prefix}NAME", env)
+            server = _get_env_val(f"{env_prefix}SERVER", env)
+            database = _get_env_val(f"{env_prefix}DATABASE", env)
 
-            if not all([name, server, database]): # Checks if any are None (due to placeholder or not set) or empty string
-                print(f"Warning: Connection slot {i} is enabled but missing one or more required fields (Name, Server, Database). Check env vars starting with '{env_prefix}'. Skipping.", file=sys.stderr)
+            if not (name and server and database): # Any of them None (placeholder or not set) or empty string
+                missing = [field for field, value in (("Name", name), ("Server", server), ("Database", database)) if not value]
+                print(f"Warning: Connection slot {i} is enabled but missing required field(s): {', '.join(missing)}. Check env vars starting with '{env_prefix}'. Skipping.", file=sys.stderr)
                 continue
 
-            port = _get_int_env(f"{env_prefix}PORT", 1433) # Default from manifest
+            port = str(_get_int_env(f"{env_prefix}PORT", 1433, env)) # Default from manifest; kept as the string the connection string needs
 
-            auth_method_val = _get_env_val(f"{env_prefix}AUTH_METHOD")
+            auth_method_val = _get_env_val(f"{env_prefix}AUTH_METHOD", env)
             auth_method = auth_method_val if auth_method_val else "sql_server_authentication" # Default from manifest
+            if auth_method not in _AUTH_CONNECTION_PARTS:
+                print(f"Warning: Connection '{name}' (Slot {i}) uses unsupported authentication method '{auth_method}'. Skipping.", file=sys.stderr)
+                continue
 
-            username = _get_env_val(f"{env_prefix}USERNAME") # No default, can be None
-            password = _get_env_val(f"{env_prefix}PASSWORD") # No default, can be None
+            username = _get_env_val(f"{env_prefix}USERNAME", env) # No default, can be None
+            password = _get_env_val(f"{env_prefix}PASSWORD", env) # No default, can be None
 
-            driver_val = _get_env_val(f"{env_prefix}DRIVER")
+            driver_val = _get_env_val(f"{env_prefix}DRIVER", env)
             driver = driver_val if driver_val else "ODBC Driver 17 for SQL Server" # Default from manifest
 
-            trust_cert = _get_bool_env(f"{env_prefix}TRUST_CERT", False) # Default from manifest
+            trust_cert = _get_bool_env(f"{env_prefix}TRUST_CERT", False, env) # Default from manifest
 
             connection_details = {
                 "name": name,
@@ -91,8 +145,15 @@ def load_connections_from_env():
                 "trust_cert": trust_cert
             }
 
-            if connection_details["auth_method"] == "sql_server_authentication" and not connection_details["username"]:
-                print(f"Warning: Connection '{name}' (Slot {i}) uses SQL Server Authentication but Username is not provided. This might lead to connection issues.", file=sys.stderr)
+            # The connection string for the default database is assembled and validated once here;
+            # tool calls only look it up.
+            try:
+                connection_details["connection_string"] = _build_connection_string(
+                    server, port, database, auth_method, driver, username, password, trust_cert
+                )
+            except ValueError as e:
+                print(f"Warning: Connection '{name}' (Slot {i}) is misconfigured: {e} Skipping.", file=sys.stderr)
+                continue
 
             active_connections.append(connection_details)
 
@@ -102,64 +163,509 @@ def load_connections_from_env():
     return {"connections": active_connections}
 
 
-USER_CONFIG_DATA = None # This will be populated by load_connections_from_env
+CONNECT_TIMEOUT_SECONDS = 5
 
-def get_db_connection(
+# Connection pool sizing. Idle connections are kept per connection string and reused across
+# tool calls so that each call does not pay the TCP + TLS + login handshake again.
+POOL_MIN_SIZE = _get_int_env("MSSQL_POOL_MIN", 2) # Opened at startup and kept even past the idle timeout
+POOL_MAX_SIZE = _get_int_env("MSSQL_POOL_MAX", 8) # Upper bound on open connections per pool
+POOL_IDLE_SECONDS = _get_int_env("MSSQL_POOL_IDLE_SECONDS", 300)
+POOL_SWEEP_SECONDS = 30 # How often the background sweeper prunes idle connections of all pools
+
+# Rows fetched per round trip when reading result sets.
+FETCH_ARRAYSIZE = max(1, _get_int_env("MSSQL_FETCH_ARRAYSIZE", 1000))
+MAX_FETCH_BATCH_SIZE = max(FETCH_ARRAYSIZE, 10000) # Upper bound for execute_query's batch_size
+
+# Maximum number of rows execute_query returns (0 disables the cap). Once the cap is reached the
+# rest of the result set is cancelled on the server rather than fetched.
+MAX_ROWS = max(0, _get_int_env("MSSQL_MAX_ROWS", 10000))
+
+# TDS packet size requested for new connections (0 keeps the driver default). Larger packets mean
+# fewer network reads for wide or long result sets; the server may still negotiate it down.
+PACKET_SIZE = _get_int_env("MSSQL_PACKET_SIZE", 0)
+SQL_ATTR_PACKET_SIZE = 112 # ODBC connection attribute id, not exported by pyodbc
+
+_CONNECT_KWARGS = {"timeout": CONNECT_TIMEOUT_SECONDS}
+if PACKET_SIZE > 0:
+    _CONNECT_KWARGS["attrs_before"] = {SQL_ATTR_PACKET_SIZE: PACKET_SIZE} # Must be set before connecting
+
+class PooledConnection:
+    """
+    A pooled pyodbc connection. Attribute access is delegated to the underlying connection; in
+    addition it keeps one cursor per repeatedly executed statement for as long as it stays open.
+    """
+
+    __slots__ = ("_connection", "_statement_cursors", "_used_cursors")
+
+    def __init__(self, connection):
+        object.__setattr__(self, "_connection", connection)
+        object.__setattr__(self, "_statement_cursors", {})
+        object.__setattr__(self, "_used_cursors", set()) # Handed out since the last finish_statements()
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._connection, name, value)
+
+    def statement_cursor(self, sql: str):
+        """
+        Returns the cursor dedicated to `sql` on this connection, which saves allocating a statement
+        handle per call. pyodbc only prepares statements that have parameters and keeps the last one
+        prepared on its cursor, so executing the same parameterized text again only binds the new
+        parameters. Statements without parameters are executed directly every time.
+        """
+        cursor = self._statement_cursors.get(sql)
+        if cursor is None:
+            cursor = self._connection.cursor()
+            self._statement_cursors[sql] = cursor
+        self._used_cursors.add(cursor)
+        return cursor
+
+    def finish_statements(self):
+        """
+        Discards any unread results on the statement cursors handed out since the last call, e.g. of
+        a read cut short by an error. Without MARS a connection cannot run another statement while
+        one still has pending results, so this runs before it is reused. Cursors that were not used
+        in the meantime are left alone.
+        """
+        while self._used_cursors:
+            cursor = self._used_cursors.pop()
+            while cursor.nextset():
+                pass
+
+
+class ConnectionPool:
+    """A thread-safe pool of pyodbc connections that share a single connection string."""
+
+    def __init__(self, connection_string: str, server_addr: str, min_size: int, max_size: int, idle_seconds: int):
+        self._connection_string = connection_string
+        self._server_addr = server_addr # Only used in error messages
+        self._min_size = max(0, min_size)
+        self._max_size = max(1, max_size)
+        self._idle_seconds = idle_seconds
+        self._idle = collections.deque() # (connection, last_used) pairs, most recently used on the right
+        self._checked_out = 0
+        self._retired = False # Set once the pool is dropped from _POOLS; connections are then closed on return
+        self._cond = threading.Condition()
+
+    def _connect(self):
+        try:
+            return PooledConnection(pyodbc.connect(self._connection_string, **_CONNECT_KWARGS))
+        except pyodbc.Error as ex:
+            raise ConnectionError(f"Failed to connect to SQL Server '{self._server_addr}': {ex}")
+
+    def _prune_idle(self, now: float) -> list:
+        """Removes connections idle longer than the timeout, keeping at least min_size. Caller holds the lock."""
+        expired = []
+        while len(self._idle) > self._min_size and now - self._idle[0][1] > self._idle_seconds:
+            expired.append(self._idle.popleft()[0])
+        return expired
+
+    def prune(self):
+        """Closes connections that have been idle longer than the timeout, keeping at least min_size."""
+        with self._cond:
+            expired = self._prune_idle(time.monotonic())
+        for conn in expired:
+            self._close_quietly(conn)
+
+    def retire_if_unused(self) -> bool:
+        """Marks the pool as retired if it has no open connections. Returns whether it was retired."""
+        with self._cond:
+            if self._idle or self._checked_out:
+                return False
+            self._retired = True
+            return True
+
+    @staticmethod
+    def _close_quietly(conn):
+        try:
+            conn.close()
+        except pyodbc.Error:
+            pass
+
+    @staticmethod
+    def _is_alive(conn) -> bool:
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1").fetchall()
+            return True
+        except pyodbc.Error:
+            return False
+
+    def _checkout(self, reuse: bool = True):
+        """
+        Takes the most recently used idle connection, or opens one. With reuse=False a new connection
+        is always opened, so idle ones stay available to other callers; the least recently used idle
+        connection is closed only if the pool is otherwise full.
+        """
+        deadline = time.monotonic() + CONNECT_TIMEOUT_SECONDS
+        expired = []
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                expired += self._prune_idle(now)
+                if not reuse and self._checked_out < self._max_size:
+                    if len(self._idle) + self._checked_out >= self._max_size:
+                        expired.append(self._idle.popleft()[0])
+                    entry = None
+                    self._checked_out += 1
+                    break
+                if reuse and (self._idle or self._checked_out < self._max_size):
+                    entry = self._idle.pop() if self._idle else None
+                    self._checked_out += 1
+                    break
+                if now >= deadline:
+                    raise ConnectionError(f"Connection pool for SQL Server '{self._server_addr}' is exhausted ({self._max_size} connections in use).")
+                self._cond.wait(deadline - now)
+
+        for conn in expired:
+            self._close_quietly(conn)
+
+        try:
+            if entry is not None:
+                conn, last_used = entry
+                # Connections kept around past the idle timeout (to honour min_size) may have been
+                # dropped by the server or a firewall, so check them before handing them out.
+                if time.monotonic() - last_used <= self._idle_seconds or self._is_alive(conn):
+                    return conn
+                self._close_quietly(conn)
+            return self._connect()
+        except BaseException:
+            with self._cond:
+                self._checked_out -= 1
+                self._cond.notify()
+            raise
+
+    def warm(self, count: int):
+        """Opens connections until at least `count` (capped at max_size) are open. Connect errors propagate."""
+        while True:
+            with self._cond:
+                if len(self._idle) + self._checked_out >= min(count, self._max_size):
+                    return
+                self._checked_out += 1 # Reserve the slot while connecting outside the lock
+            try:
+                conn = self._connect()
+            except BaseException:
+                with self._cond:
+                    self._checked_out -= 1
+                    self._cond.notify()
+                raise
+            with self._cond:
+                self._checked_out -= 1
+                retired = self._retired
+                if not retired:
+                    self._idle.append((conn, time.monotonic()))
+                self._cond.notify()
+            if retired:
+                self._close_quietly(conn)
+                return
+
+    def _checkin(self, conn, commit: bool, reuse: bool):
+        """
+        Commits (or rolls back) the open transaction, then returns the connection to the pool if it is
+        still usable. A failed commit is raised to the caller after the connection is discarded; a
+        failed rollback only discards it.
+        """
+        failure = None
+        try:
+            if reuse:
+                conn.finish_statements()
+        except pyodbc.Error:
+            reuse = False
+        try:
+            if not conn.autocommit:
+                if commit:
+                    conn.commit()
+                else:
+                    conn.rollback()
+        except pyodbc.Error as ex:
+            reuse = False
+            if commit:
+                failure = ex
+
+        with self._cond:
+            reusable = reuse and not conn.closed and not self._retired
+            self._checked_out -= 1
+            if reusable:
+                self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+        if not reusable:
+            self._close_quietly(conn)
+        if failure is not None:
+            raise failure
+
+    @contextlib.contextmanager
+    def connection(self, autocommit: bool = False, reuse: bool = True):
+        """
+        Checks a connection out of the pool for the duration of a `with` block. Unless autocommit is
+        requested, the transaction is committed on exit (a commit error is raised) or rolled back if
+        the block raised.
+
+        With reuse=False a new connection is opened for the block and closed afterwards, for callers
+        that may leave session state behind (USE, SET options, #temp tables, open transactions). It
+        still counts towards max_size but leaves the idle connections to other callers. Opening it is
+        only cheap where the ODBC driver manager pools connections and resets the session on reuse:
+        on by default on Windows, but on Linux and macOS only if pooling is enabled for unixODBC or
+        iODBC in odbcinst.ini. Otherwise every such block pays a full TCP + TLS + login handshake.
+        """
+        conn = self._checkout(reuse)
+        try:
+            if conn.autocommit != autocommit:
+                conn.autocommit = autocommit
+            yield conn
+        except BaseException:
+            self._checkin(conn, False, reuse)
+            raise
+        else:
+            self._checkin(conn, True, reuse)
+
+
+_POOLS: dict[str, ConnectionPool] = {}
+_POOLS_LOCK = threading.Lock()
+
+def _get_pool(connection_string: str, server_addr: str, min_size: int = 0) -> ConnectionPool:
+    """
+    Returns the pool for a connection string, creating it on first use with `min_size` connections
+    kept past the idle timeout.
+    """
+    pool = _POOLS.get(connection_string)
+    if pool is None:
+        with _POOLS_LOCK:
+            pool = _POOLS.get(connection_string)
+            if pool is None:
+                pool = ConnectionPool(connection_string, server_addr, min_size, POOL_MAX_SIZE, POOL_IDLE_SECONDS)
+                _POOLS[connection_string] = pool
+    return pool
+
+APPLICATION_NAME = "mssql-dxt-server" # Sent as APP= so pooled connections are identifiable on the server
+
+_CONNECTION_STRINGS: dict[tuple, str] = {}
+
+def _quote_odbc_value(value: str) -> str:
+    """Braces a connection string value so that ';', '{' and '}' inside it are taken literally."""
+    return "{" + value.replace("}", "}}") + "}"
+
+def _trusted_connection_parts(uname: str, pwd: str) -> list:
+    return ["Trusted_Connection=yes"]
+
+def _sql_login_parts(uname: str, pwd: str) -> list:
+    if not uname: # Password can be blank for some SQL users
+        raise ValueError("Username is required for SQL Server Authentication.")
+    # Password can be None or empty string, pyodbc handles it.
+    # Ensure PWD key is added even if password is blank, but with proper quoting for empty.
+    return [f"UID={_quote_odbc_value(uname)}", f"PWD={_quote_odbc_value(pwd or '')}"]
+
+# Connection string fragments for each supported authentication method.
+_AUTH_CONNECTION_PARTS = {
+    "windows_authentication": _trusted_connection_parts,
+    "sql_server_authentication": _sql_login_parts,
+}
+
+def _build_connection_string(
     server_addr: str,
-    port_num: str, # pyodbc expects port as string in connection string
+    port_num: str,
     db_name: str,
     auth_method: str,
     odbc_driver: str,
     uname: str = None,
     pwd: str = None,
     trust_cert_bool: bool = False
-):
-    """Establishes and returns a pyodbc connection to the SQL Server using provided details."""
+) -> str:
+    """Validates connection details and assembles the ODBC connection string for them."""
     if not server_addr or not db_name or not odbc_driver:
         raise ValueError("Server address, database name, and ODBC driver must be provided.")
 
     conn_str_parts = [
         f"DRIVER={{{odbc_driver}}}",
         f"SERVER={server_addr},{port_num}",
-        f"DATABASE={db_name}",
+        f"DATABASE={_quote_odbc_value(db_name)}",
     ]
 
-    if auth_method == "windows_authentication":
-        conn_str_parts.append("Trusted_Connection=yes")
-    elif auth_method == "sql_server_authentication":
-        if not uname: # Password can be blank for some SQL users
-            raise ValueError("Username is required for SQL Server Authentication.")
-        conn_str_parts.append(f"UID={uname}")
-        # Password can be None or empty string, pyodbc handles it.
-        # Ensure PWD key is added even if password is blank, but with proper quoting for empty.
-        conn_str_parts.append(f"PWD={{{pwd or ''}}}")
-    else:
+    auth_parts = _AUTH_CONNECTION_PARTS.get(auth_method)
+    if auth_parts is None:
         raise ValueError(f"Unsupported authentication method: {auth_method}")
+    conn_str_parts.extend(auth_parts(uname, pwd))
 
     if trust_cert_bool:
         conn_str_parts.append("TrustServerCertificate=yes")
 
-    connection_string = ";".join(conn_str_parts)
-    # print(f"Attempting connection with: {connection_string.replace(pwd, '********') if pwd else connection_string}", file=sys.stderr) # For debugging
+    conn_str_parts.append(f"APP={APPLICATION_NAME}")
 
-    try:
-        conn = pyodbc.connect(connection_string, timeout=5) # Added timeout
-        return conn
-    except pyodbc.Error as ex:
-        raise ConnectionError(f"Failed to connect to SQL Server '{server_addr}': {ex}")
+    return ";".join(conn_str_parts)
 
+def _get_pool_for(
+    server_addr: str,
+    port_num: str,
+    db_name: str,
+    auth_method: str,
+    odbc_driver: str,
+    uname: str = None,
+    pwd: str = None,
+    trust_cert_bool: bool = False
+) -> ConnectionPool:
+    """Returns the connection pool for a set of connection details."""
+    # Connection details are fixed per configured connection (plus database override), so the
+    # connection string is only assembled and validated the first time a combination is seen;
+    # later calls are a dict lookup followed by a pool checkout.
+    key = (server_addr, port_num, db_name, auth_method, odbc_driver, uname, pwd, trust_cert_bool)
+    connection_string = _CONNECTION_STRINGS.get(key)
+    if connection_string is None:
+        connection_string = _build_connection_string(*key)
+        _CONNECTION_STRINGS[key] = connection_string
+
+    return _get_pool(connection_string, server_addr)
+
+
+def _pool_for_details(conn_details: dict, db_name: str = None) -> ConnectionPool:
+    """Returns the pool for a configured connection, optionally switched to another database."""
+    if not db_name or db_name == conn_details["database"]:
+        # Only the default database's pool is warmed at startup and keeps POOL_MIN_SIZE connections.
+        return _get_pool(conn_details["connection_string"], conn_details["server"], POOL_MIN_SIZE)
+    return _get_pool_for(
+        server_addr=conn_details["server"],
+        port_num=conn_details["port"],
+        db_name=db_name,
+        auth_method=conn_details["auth_method"],
+        odbc_driver=conn_details["driver"],
+        uname=conn_details["username"],
+        pwd=conn_details["password"],
+        trust_cert_bool=conn_details["trust_cert"]
+    )
+
+
+# The environment is read once, when the module is imported; tools only look connections up. The
+# result is exposed read-only so request threads can share it without locking.
+USER_CONFIG_DATA = types.MappingProxyType(
+    {"connections": tuple(types.MappingProxyType(c) for c in load_connections_from_env()["connections"])}
+)
+_CONNECTIONS_BY_NAME = {c["name"]: c for c in USER_CONFIG_DATA["connections"]}
+_CONFIGURED_CONNECTIONS_RESPONSE = _dumps({"connections": [{"name": c["name"]} for c in USER_CONFIG_DATA["connections"]]})
 
 def _get_connection_details_by_name(connection_name: str):
     """Helper to find connection details from USER_CONFIG_DATA."""
-    global USER_CONFIG_DATA
-    if USER_CONFIG_DATA is None: # Ensure it's loaded once
-        USER_CONFIG_DATA = load_connections_from_env() # Changed function call
+    try:
+        return _CONNECTIONS_BY_NAME[connection_name]
+    except KeyError:
+        raise ValueError(f"Connection name '{connection_name}' not found in configuration.") from None
+
+# Databases, tables and column schemas change rarely, so their responses are cached briefly; agents
+# tend to repeat the same discovery calls several times per turn. Set to 0 to disable.
+SCHEMA_CACHE_TTL_SECONDS = _get_int_env("MSSQL_SCHEMA_CACHE_TTL", 60)
+
+_SCHEMA_CACHE: dict[tuple, tuple[float, str]] = {} # key -> (expires_at, response)
+_SCHEMA_CACHE_LOCK = threading.Lock()
+_SCHEMA_CACHE_GENERATIONS: dict[str, int] = {} # connection_name -> number of invalidations so far
+
+def _is_error_response(response: str) -> bool:
+    return response.startswith('{"status"') # Only error responses lead with "status" in metadata tools
+
+def _drop_cached_metadata(connection_name: str):
+    """Forgets every cached metadata response for a connection."""
+    with _SCHEMA_CACHE_LOCK:
+        _SCHEMA_CACHE_GENERATIONS[connection_name] = _SCHEMA_CACHE_GENERATIONS.get(connection_name, 0) + 1
+        for stale_key in [k for k in _SCHEMA_CACHE if k[1] == connection_name]:
+            del _SCHEMA_CACHE[stale_key]
+
+def _cached_metadata(func):
+    """Caches successful responses of a read-only metadata tool for SCHEMA_CACHE_TTL_SECONDS."""
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if SCHEMA_CACHE_TTL_SECONDS <= 0:
+            return func(*args, **kwargs)
+
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        key = (func.__name__, *bound.arguments.values())
+        cached = _SCHEMA_CACHE.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+
+        connection_name = bound.arguments.get("connection_name")
+        generation = _SCHEMA_CACHE_GENERATIONS.get(connection_name, 0)
+        response = func(*args, **kwargs)
+        if _is_error_response(response):
+            return response # Not cached; database errors already dropped the connection's entries
+
+        now = time.monotonic()
+        with _SCHEMA_CACHE_LOCK:
+            for stale_key in [k for k, (expires_at, _) in _SCHEMA_CACHE.items() if expires_at <= now]:
+                del _SCHEMA_CACHE[stale_key]
+            # Not stored if execute_query changed the connection while this response was being built.
+            if _SCHEMA_CACHE_GENERATIONS.get(connection_name, 0) == generation:
+                _SCHEMA_CACHE[key] = (now + SCHEMA_CACHE_TTL_SECONDS, response)
+        return response
+
+    return wrapper
+
+# Tool bodies block inside pyodbc, so they run on worker threads to keep the MCP event loop free.
+# Concurrency is capped at the pool size so calls wait here rather than on the connection pool.
+_WORKER_COUNT = max(1, POOL_MAX_SIZE)
+_WORKER_EXECUTOR = concurrent.futures.ThreadPoolExecutor(max_workers=_WORKER_COUNT, thread_name_prefix="mssql-dxt")
+_WORKER_SLOTS = asyncio.Semaphore(_WORKER_COUNT)
+
+def _run_in_worker(func):
+    """Turns a blocking tool function into a coroutine that runs it on the worker thread pool."""
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        async with _WORKER_SLOTS:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(_WORKER_EXECUTOR, functools.partial(func, *args, **kwargs))
+
+    return wrapper
+
+SERVER_NAME_SQL = "SELECT @@SERVERNAME;" # Used by the startup connection tests
+LIST_DATABASES_SQL = "SELECT name FROM sys.databases WHERE state = 0 ORDER BY name;"
+LIST_TABLES_SQL = "SELECT TABLE_SCHEMA, TABLE_NAME FROM INFORMATION_SCHEMA.TABLES WHERE TABLE_TYPE = 'BASE TABLE' ORDER BY TABLE_SCHEMA, TABLE_NAME;"
+TABLE_SCHEMA_SQL = """
+    SELECT
+        COLUMN_NAME,
+        DATA_TYPE,
+        ISNULL(CHARACTER_MAXIMUM_LENGTH, -1), -- -1 for types without a character length
+        IS_NULLABLE
+    FROM INFORMATION_SCHEMA.COLUMNS
+    WHERE TABLE_NAME = ? AND TABLE_SCHEMA = ?
+    ORDER BY ORDINAL_POSITION;
+    """
 
-    connections = USER_CONFIG_DATA.get("connections", [])
-    for conn_details in connections:
-        if conn_details.get("name") == connection_name:
-            return conn_details
-    raise ValueError(f"Connection name '{connection_name}' not found in configuration.")
+# Fixed parts of the small status responses are kept as templates; only the connection name and
+# message go through the JSON encoder.
+_ERROR_RESPONSE_TEMPLATE = '{"status":"error","connection_name":%s,"message":%s}'
+_ROWS_AFFECTED_RESPONSE_TEMPLATE = '{"status":"success","connection_name":%s,"message":"Query executed successfully. Rows affected: %d"}'
+_NO_ROWCOUNT_RESPONSE_TEMPLATE = '{"status":"success","connection_name":%s,"message":"Query executed successfully. No rows returned and no rowcount available."}'
+
+def _error_response(connection_name: str, message: str) -> str:
+    return _ERROR_RESPONSE_TEMPLATE % (_dumps(connection_name), _dumps(message))
+
+def _no_rows_response(connection_name: str, rowcount: int) -> str:
+    """Response for a query that completed without returning a result set."""
+    if rowcount != -1:
+        return _ROWS_AFFECTED_RESPONSE_TEMPLATE % (_dumps(connection_name), rowcount)
+    return _NO_ROWCOUNT_RESPONSE_TEMPLATE % _dumps(connection_name)
+
+def _iter_chunks(cursor):
+    """Yields the rows of the cursor's current result set in chunks of FETCH_ARRAYSIZE."""
+    while True:
+        chunk = cursor.fetchmany(FETCH_ARRAYSIZE)
+        if not chunk:
+            return
+        yield chunk
+
+CATALOG_BOOTSTRAP_SQL = LIST_DATABASES_SQL + "\n" + LIST_TABLES_SQL
+CATALOG_BOOTSTRAP_WITH_SCHEMA_SQL = CATALOG_BOOTSTRAP_SQL + "\n" + TABLE_SCHEMA_SQL
+
+def _column_info(row) -> dict:
+    """Converts a TABLE_SCHEMA_SQL row into the column description returned by the schema tools."""
+    column_name, data_type, max_length, is_nullable = row
+    return {
+        "column_name": column_name,
+        "data_type": data_type,
+        "max_length": max_length,
+        "is_nullable": is_nullable
+    }
 
 @mcp.tool()
 def list_configured_connections() -> str:
@@ -167,228 +673,326 @@ def list_configured_connections() -> str:
     Lists the names of all configured MSSQL connections.
     Returns data as a JSON string: { "connections": [{"name": "conn1"}, {"name": "conn2"}, ...] }
     """
-    global USER_CONFIG_DATA
-    if USER_CONFIG_DATA is None:
-        USER_CONFIG_DATA = load_connections_from_env() # Changed function call
-
-    connections = USER_CONFIG_DATA.get("connections", [])
-    return json.dumps({"connections": [{"name": c.get("name")} for c in connections if c.get("name")]})
+    return _CONFIGURED_CONNECTIONS_RESPONSE # The configuration does not change after startup
 
 @mcp.tool()
-def execute_query(connection_name: str, query: str) -> str:
+@_run_in_worker
+def execute_query(connection_name: str, query: str, column_major: bool = False, max_rows: int = None, batch_size: int = None, autocommit: bool = False) -> str:
     """
     Executes a SQL query against the specified MSSQL connection.
     Returns data as a JSON string: { "columns": ["col1", ...], "rows": [[val1, ...], ...] }
-    or an error message.
+    or an error message. With column_major=True the values are grouped per column instead:
+    { "columns": ["col1", ...], "data": [[col1_val1, col1_val2, ...], ...] }, which is more compact
+    for long results. At most max_rows rows are returned (never more than the server's configured
+    cap, MSSQL_MAX_ROWS); if the result was cut short the response includes "truncated": true.
+    batch_size sets how many rows are fetched per round trip. With autocommit=True each statement
+    commits on its own and no transaction is committed afterwards, which saves a round trip for
+    read-only queries.
     """
+    row_limit = MAX_ROWS
+    if max_rows is not None and max_rows > 0:
+        row_limit = min(max_rows, MAX_ROWS) if MAX_ROWS else max_rows
+    fetch_size = min(batch_size, MAX_FETCH_BATCH_SIZE) if batch_size is not None and batch_size > 0 else FETCH_ARRAYSIZE
+    if row_limit:
+        fetch_size = min(fetch_size, row_limit + 1) # One row past the cap is enough to detect truncation
+    conn_details = None
     try:
         conn_details = _get_connection_details_by_name(connection_name)
-        with get_db_connection(
-            server_addr=conn_details["server"],
-            port_num=str(conn_details.get("port", 1433)),
-            db_name=conn_details["database"],
-            auth_method=conn_details["auth_method"],
-            odbc_driver=conn_details["driver"],
-            uname=conn_details.get("username"),
-            pwd=conn_details.get("password"),
-            trust_cert_bool=conn_details.get("trust_cert", False)
-        ) as conn:
+        # Arbitrary SQL can change session state, so the query gets its own connection, which is
+        # closed afterwards rather than shared with later calls.
+        with _pool_for_details(conn_details).connection(autocommit, reuse=False) as conn:
             with conn.cursor() as cursor:
+                cursor.arraysize = fetch_size
                 cursor.execute(query)
 
-                results = {"columns": [], "rows": []}
-                if cursor.description:
-                    results["columns"] = [column[0] for column in cursor.description]
-
-                fetched_rows_list = []
-                try:
-                    fetched_rows_from_cursor = cursor.fetchall()
-                    if fetched_rows_from_cursor:
-                         fetched_rows_list = [list(row_item) for row_item in fetched_rows_from_cursor]
-                         results["rows"] = fetched_rows_list
-                except pyodbc.ProgrammingError:
-                    pass # Query did not return rows
-
-                if not results["columns"] and not results["rows"]:
-                    if cursor.rowcount != -1:
-                        return json.dumps({"status": "success", "connection_name": connection_name, "message": f"Query executed successfully. Rows affected: {cursor.rowcount}"})
-                    else:
-                        return json.dumps({"status": "success", "connection_name": connection_name, "message": "Query executed successfully. No rows returned and no rowcount available."})
-
-                return json.dumps({"connection_name": connection_name, **results})
+                # No result set (DML/DDL, or a procedure that selects nothing): report the rowcount
+                # without attempting a fetch, which would raise.
+                if cursor.description is None:
+                    return _no_rows_response(connection_name, cursor.rowcount)
+
+                columns = [column[0] for column in cursor.description]
+
+                # Rows are fetched in chunks and encoded as they arrive, so the full result set is
+                # never held as both pyodbc Rows and a list of lists at the same time.
+                rows_json = io.StringIO()
+                column_data = [[] for _ in columns] # Only filled for column_major responses
+                row_count = 0
+                truncated = False
+                while True:
+                    # Never fetch more than one row past the cap, however large the batch size.
+                    chunk = cursor.fetchmany(min(fetch_size, row_limit - row_count + 1) if row_limit else fetch_size)
+                    if not chunk:
+                        break
+                    if row_limit and row_count + len(chunk) > row_limit:
+                        chunk = chunk[:row_limit - row_count]
+                        truncated = True
+                    if chunk:
+                        if column_major:
+                            for values, chunk_values in zip(column_data, zip(*chunk)):
+                                values.extend(chunk_values)
+                        else:
+                            if row_count:
+                                rows_json.write(", ")
+                            rows_json.write(_dumps(chunk)[1:-1]) # Strip the chunk's outer brackets
+                        row_count += len(chunk)
+                    if truncated:
+                        cursor.cancel() # Stop the server from sending the rest of the result set
+                        break
+
+                if column_major:
+                    response = {"connection_name": connection_name, "columns": columns, "data": column_data}
+                    if truncated:
+                        response["truncated"] = True
+                    return _dumps(response)
+
+                truncated_json = ', "truncated": true' if truncated else ""
+                return f'{{"connection_name": {_dumps(connection_name)}, "columns": {_dumps(columns)}, "rows": [{rows_json.getvalue()}]{truncated_json}}}'
 
     except (pyodbc.Error, ConnectionError, ValueError) as e:
-        return json.dumps({"status": "error", "connection_name": connection_name, "message": str(e)})
+        return _error_response(connection_name, str(e))
     except Exception as e:
-        return json.dumps({"status": "error", "connection_name": connection_name, "message": f"An unexpected error occurred: {str(e)}"})
+        return _error_response(connection_name, f"An unexpected error occurred: {str(e)}")
+    finally:
+        # The query may have created, altered or dropped objects (even a SELECT can, via a procedure
+        # or SELECT INTO), so cached catalog responses for this connection can no longer be trusted.
+        if conn_details is not None: # Unknown names have nothing cached
+            _drop_cached_metadata(connection_name)
 
 @mcp.tool()
+@_run_in_worker
+@_cached_metadata
 def list_databases(connection_name: str) -> str:
     """
     Lists all databases on the specified SQL server instance.
     Returns data as a JSON string: { "databases": ["db1", "db2", ...] } or an error message.
     """
-    query = "SELECT name FROM sys.databases WHERE state = 0 ORDER BY name;"
     try:
         conn_details = _get_connection_details_by_name(connection_name)
-        with get_db_connection(
-            server_addr=conn_details["server"],
-            port_num=str(conn_details.get("port", 1433)),
-            db_name=conn_details["database"], # Connect to default db to list others
-            auth_method=conn_details["auth_method"],
-            odbc_driver=conn_details["driver"],
-            uname=conn_details.get("username"),
-            pwd=conn_details.get("password"),
-            trust_cert_bool=conn_details.get("trust_cert", False)
-        ) as conn:
-            with conn.cursor() as cursor:
-                cursor.execute(query)
-                databases = [row[0] for row in cursor.fetchall()]
-                return json.dumps({"connection_name": connection_name, "databases": databases})
-    except (pyodbc.Error, ConnectionError, ValueError) as e:
-        return json.dumps({"status": "error", "connection_name": connection_name, "message": str(e)})
+        with _pool_for_details(conn_details).connection(autocommit=True) as conn: # Read-only, so there is no transaction to commit on exit
+            cursor = conn.statement_cursor(LIST_DATABASES_SQL)
+            cursor.execute(LIST_DATABASES_SQL)
+            databases = []
+            for chunk in _iter_chunks(cursor):
+                databases.extend([name for (name,) in chunk])
+            return _dumps({"connection_name": connection_name, "databases": databases})
+    except pyodbc.Error as e:
+        _drop_cached_metadata(connection_name) # The cached view of this connection may be stale
+        return _error_response(connection_name, str(e))
+    except (ConnectionError, ValueError) as e:
+        return _error_response(connection_name, str(e))
     except Exception as e:
-        return json.dumps({"status": "error", "connection_name": connection_name, "message": f"An unexpected error occurred: {str(e)}"})
+        return _error_response(connection_name, f"An unexpected error occurred: {str(e)}")
 
 @mcp.tool()
+@_run_in_worker
+@_cached_metadata
 def list_tables(connection_name: str, database_name: str = None) -> str:
     """
     Lists all tables in the specified database (or the connection's default if not provided)
     on the specified MSSQL connection.
     Returns data as a JSON string: { "tables": ["table1", "table2", ...] } or an error message.
     """
-    query = "SELECT TABLE_SCHEMA, TABLE_NAME FROM INFORMATION_SCHEMA.TABLES WHERE TABLE_TYPE = 'BASE TABLE' ORDER BY TABLE_SCHEMA, TABLE_NAME;"
     try:
         conn_details = _get_connection_details_by_name(connection_name)
         current_db_name = database_name if database_name else conn_details["database"]
-        with get_db_connection(
-            server_addr=conn_details["server"],
-            port_num=str(conn_details.get("port", 1433)),
-            db_name=current_db_name,
-            auth_method=conn_details["auth_method"],
-            odbc_driver=conn_details["driver"],
-            uname=conn_details.get("username"),
-            pwd=conn_details.get("password"),
-            trust_cert_bool=conn_details.get("trust_cert", False)
-        ) as conn:
-            with conn.cursor() as cursor:
-                cursor.execute(query)
-                tables = [f"{row[0]}.{row[1]}" for row in cursor.fetchall()]
-                return json.dumps({"connection_name": connection_name, "database_name": current_db_name, "tables": tables})
-    except (pyodbc.Error, ConnectionError, ValueError) as e:
-        return json.dumps({"status": "error", "connection_name": connection_name, "message": str(e)})
+        with _pool_for_details(conn_details, current_db_name).connection(autocommit=True) as conn: # Read-only, so there is no transaction to commit on exit
+            cursor = conn.statement_cursor(LIST_TABLES_SQL)
+            cursor.execute(LIST_TABLES_SQL)
+            tables = []
+            for chunk in _iter_chunks(cursor):
+                tables.extend([f"{schema}.{table}" for schema, table in chunk])
+            return _dumps({"connection_name": connection_name, "database_name": current_db_name, "tables": tables})
+    except pyodbc.Error as e:
+        _drop_cached_metadata(connection_name) # The cached view of this connection may be stale
+        return _error_response(connection_name, str(e))
+    except (ConnectionError, ValueError) as e:
+        return _error_response(connection_name, str(e))
     except Exception as e:
-        return json.dumps({"status": "error", "connection_name": connection_name, "message": f"An unexpected error occurred: {str(e)}"})
+        return _error_response(connection_name, f"An unexpected error occurred: {str(e)}")
+
+@mcp.tool()
+async def list_tables_on_connections(connection_names: list[str] = None, database_name: str = None) -> str:
+    """
+    Lists all tables on several MSSQL connections at once (all configured connections if none are
+    given), in the specified database or each connection's default. The connections are queried
+    concurrently. Returns data as a JSON string: { "results": { "conn1": <list_tables result>, ... } }
+    where each entry is what list_tables returns for that connection, including per-connection errors.
+    """
+    if not connection_names:
+        connection_names = list(_CONNECTIONS_BY_NAME)
+    connection_names = list(dict.fromkeys(connection_names)) # Drop duplicates, keep order
+
+    # Each list_tables call runs on its own worker thread and goes through the metadata cache.
+    results = await asyncio.gather(*(list_tables(name, database_name) for name in connection_names))
+    # The per-connection results are already JSON, so they are spliced in rather than re-parsed.
+    entries = ", ".join(f"{_dumps(name)}: {result}" for name, result in zip(connection_names, results))
+    return f'{{"results": {{{entries}}}}}'
 
 @mcp.tool()
+@_run_in_worker
+@_cached_metadata
 def get_table_schema(connection_name: str, table_name: str, schema_name: str = 'dbo', database_name: str = None) -> str:
     """
     Gets the schema for a specified table on a specified MSSQL connection.
     Schema name defaults to 'dbo'. Database defaults to connection's default.
     Returns data as a JSON string or an error message.
     """
-    query = """
-    SELECT
-        COLUMN_NAME,
-        DATA_TYPE,
-        CHARACTER_MAXIMUM_LENGTH,
-        IS_NULLABLE
-    FROM INFORMATION_SCHEMA.COLUMNS
-    WHERE TABLE_NAME = ? AND TABLE_SCHEMA = ?
-    ORDER BY ORDINAL_POSITION;
+    try:
+        conn_details = _get_connection_details_by_name(connection_name)
+        current_db_name = database_name if database_name else conn_details["database"]
+        with _pool_for_details(conn_details, current_db_name).connection(autocommit=True) as conn: # Read-only, so there is no transaction to commit on exit
+            cursor = conn.statement_cursor(TABLE_SCHEMA_SQL)
+            cursor.execute(TABLE_SCHEMA_SQL, table_name, schema_name)
+            columns = []
+            if cursor.description:
+                columns = [_column_info(row) for row in cursor.fetchall()]
+            if not columns:
+                 return _dumps({"status": "error", "connection_name": connection_name, "database_name": current_db_name, "message": f"Table '{schema_name}.{table_name}' not found or has no columns in database '{current_db_name}'."})
+            return _dumps({"connection_name": connection_name, "database_name": current_db_name, "schema": columns})
+    except pyodbc.Error as e:
+        _drop_cached_metadata(connection_name) # The cached view of this connection may be stale
+        return _error_response(connection_name, str(e))
+    except (ConnectionError, ValueError) as e:
+        return _error_response(connection_name, str(e))
+    except Exception as e:
+        return _error_response(connection_name, f"An unexpected error occurred: {str(e)}")
+
+@mcp.tool()
+@_run_in_worker
+@_cached_metadata
+def get_catalog_bootstrap(connection_name: str, database_name: str = None, table_name: str = None, schema_name: str = 'dbo') -> str:
+    """
+    Lists the databases on the server and the tables in the specified database (or the connection's
+    default), plus the schema of table_name if given, in a single round trip to the server.
+    Returns data as a JSON string: { "databases": [...], "tables": [...], "schema": [...] } or an error message.
+    "schema" is only present when table_name is provided.
     """
+    batch = CATALOG_BOOTSTRAP_SQL
+    params = ()
+    if table_name:
+        batch = CATALOG_BOOTSTRAP_WITH_SCHEMA_SQL
+        params = (table_name, schema_name)
     try:
         conn_details = _get_connection_details_by_name(connection_name)
         current_db_name = database_name if database_name else conn_details["database"]
-        with get_db_connection(
-            server_addr=conn_details["server"],
-            port_num=str(conn_details.get("port", 1433)),
-            db_name=current_db_name,
-            auth_method=conn_details["auth_method"],
-            odbc_driver=conn_details["driver"],
-            uname=conn_details.get("username"),
-            pwd=conn_details.get("password"),
-            trust_cert_bool=conn_details.get("trust_cert", False)
-        ) as conn:
+        with _pool_for_details(conn_details, current_db_name).connection(autocommit=True) as conn: # Read-only, so there is no transaction to commit on exit
+            cursor = conn.statement_cursor(batch)
+            # One batch, one result set per statement, read in order with nextset().
+            cursor.execute(batch, *params)
+            databases = []
+            for chunk in _iter_chunks(cursor):
+                databases.extend([name for (name,) in chunk])
+            cursor.nextset()
+            tables = []
+            for chunk in _iter_chunks(cursor):
+                tables.extend([f"{schema}.{table}" for schema, table in chunk])
+            response = {"connection_name": connection_name, "database_name": current_db_name, "databases": databases, "tables": tables}
+            if table_name:
+                cursor.nextset()
+                response["schema"] = [_column_info(row) for row in cursor.fetchall()]
+            return _dumps(response)
+    except pyodbc.Error as e:
+        _drop_cached_metadata(connection_name) # The cached view of this connection may be stale
+        return _error_response(connection_name, str(e))
+    except (ConnectionError, ValueError) as e:
+        return _error_response(connection_name, str(e))
+    except Exception as e:
+        return _error_response(connection_name, f"An unexpected error occurred: {str(e)}")
+
+def _test_connection(conn_config) -> str:
+    """Connects to one configured connection and returns the result line for the startup log."""
+    conn_name = conn_config.get("name", "Unnamed Connection")
+    try:
+        # A simple query to test the connection
+        with _pool_for_details(conn_config).connection(autocommit=True) as conn:
             with conn.cursor() as cursor:
-                cursor.execute(query, table_name, schema_name)
-                columns = []
-                if cursor.description:
-                    for row in cursor.fetchall():
-                        columns.append({
-                            "column_name": row[0],
-                            "data_type": row[1],
-                            "max_length": row[2] if row[2] is not None else -1,
-                            "is_nullable": row[3]
-                        })
-                if not columns:
-                     return json.dumps({"status": "error", "connection_name": connection_name, "database_name": current_db_name, "message": f"Table '{schema_name}.{table_name}' not found or has no columns in database '{current_db_name}'."})
-                return json.dumps({"connection_name": connection_name, "database_name": current_db_name, "schema": columns})
+                server_name = cursor.execute(SERVER_NAME_SQL).fetchval()
+            if server_name:
+                return f"  SUCCESS: Connected to '{conn_name}' (Server: {server_name})."
+            return f"  SUCCESS: Connected to '{conn_name}' (Server name not retrieved)."
     except (pyodbc.Error, ConnectionError, ValueError) as e:
-        return json.dumps({"status": "error", "connection_name": connection_name, "message": str(e)})
-    except Exception as e:
-        return json.dumps({"status": "error", "connection_name": connection_name, "message": f"An unexpected error occurred: {str(e)}"})
+        return f"  FAILED to connect to '{conn_name}': {e}"
+    except Exception as e: # Catch any other unexpected errors during test
+        return f"  FAILED to connect to '{conn_name}' with an unexpected error: {e}"
 
 def perform_startup_connection_tests():
     """
-    Iterates through configured connections and attempts to connect to each one,
-    logging the results to stderr.
+    Attempts to connect to every configured connection, logging the results to stderr. The
+    connections are tested concurrently, so startup waits for the slowest one rather than the sum.
     """
-    global USER_CONFIG_DATA
-    if USER_CONFIG_DATA is None: # Ensure it's loaded once
-        USER_CONFIG_DATA = load_connections_from_env() # Changed function call
-
     connections = USER_CONFIG_DATA.get("connections", [])
     if not connections:
         print("No MSSQL connections configured.", file=sys.stderr)
         return
 
     print(f"Performing startup connection tests for {len(connections)} configured connection(s)...", file=sys.stderr)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(connections)) as executor:
+        results = list(executor.map(_test_connection, connections))
+
+    # map() returns results in configuration order; the report is written to stderr in one call.
+    report = []
+    for conn_config, result in zip(connections, results):
+        report.append(f"Testing connection: '{conn_config.get('name', 'Unnamed Connection')}'...")
+        report.append(result)
+    report.append("Startup connection tests complete.")
+    sys.stderr.write("\n".join(report) + "\n")
+
+def _sweep_pools():
+    """
+    Closes connections idle past the timeout in every pool. A pool only prunes itself when it is
+    used, and database-override pools may never be used again, so this also forgets override pools
+    that have nothing open, together with their cached connection strings.
+    """
+    for pool in list(_POOLS.values()):
+        pool.prune()
+
+    default_connection_strings = {c["connection_string"] for c in USER_CONFIG_DATA["connections"]}
+    with _POOLS_LOCK:
+        for connection_string, pool in list(_POOLS.items()):
+            if connection_string not in default_connection_strings and pool.retire_if_unused():
+                del _POOLS[connection_string]
+        for key, connection_string in list(_CONNECTION_STRINGS.items()):
+            if connection_string not in _POOLS:
+                del _CONNECTION_STRINGS[key]
+
+def _sweep_pools_periodically():
+    """Runs _sweep_pools every POOL_SWEEP_SECONDS, off the request threads."""
+    while True:
+        time.sleep(POOL_SWEEP_SECONDS)
+        try:
+            _sweep_pools()
+        except Exception as e:
+            print(f"Warning: Could not sweep idle connections: {e}", file=sys.stderr)
+
+def warm_connection_pools():
+    """
+    Pre-opens POOL_MIN_SIZE connections to the default database of every configured connection so
+    that the first tool calls do not pay for DNS, TLS and login. Failures are logged, not raised.
+    """
+    connections = USER_CONFIG_DATA.get("connections", [])
     for conn_config in connections:
         conn_name = conn_config.get("name", "Unnamed Connection")
-        print(f"Testing connection: '{conn_name}'...", file=sys.stderr)
         try:
-            # For SQL Auth, ensure username is present if method is sql_server_authentication
-            if conn_config.get("auth_method") == "sql_server_authentication" and not conn_config.get("username"):
-                raise ValueError("Username is required for SQL Server Authentication.")
-
-            # A simple query to test the connection
-            test_query = "SELECT @@SERVERNAME"
-            with get_db_connection(
-                server_addr=conn_config["server"],
-                port_num=str(conn_config.get("port", 1433)),
-                db_name=conn_config["database"],
-                auth_method=conn_config["auth_method"],
-                odbc_driver=conn_config["driver"],
-                uname=conn_config.get("username"),
-                pwd=conn_config.get("password"),
-                trust_cert_bool=conn_config.get("trust_cert", False)
-            ) as conn:
-                with conn.cursor() as cursor:
-                    cursor.execute(test_query)
-                    server_name = cursor.fetchone()
-                    if server_name:
-                        print(f"  SUCCESS: Connected to '{conn_name}' (Server: {server_name[0]}).", file=sys.stderr)
-                    else:
-                        print(f"  SUCCESS: Connected to '{conn_name}' (Server name not retrieved).", file=sys.stderr)
-        except (pyodbc.Error, ConnectionError, ValueError) as e:
-            print(f"  FAILED to connect to '{conn_name}': {e}", file=sys.stderr)
-        except Exception as e: # Catch any other unexpected errors during test
-            print(f"  FAILED to connect to '{conn_name}' with an unexpected error: {e}", file=sys.stderr)
-    print("Startup connection tests complete.", file=sys.stderr)
+            _pool_for_details(conn_config).warm(POOL_MIN_SIZE)
+        except Exception as e:
+            print(f"Warning: Could not pre-open connections for '{conn_name}': {e}", file=sys.stderr)
 
 
 if __name__ == "__main__":
     print("DEBUG: Python script main block started.", file=sys.stderr)
-    # Load config first by reading individual environment variables
-    USER_CONFIG_DATA = load_connections_from_env()
+    # Configuration was already loaded from the environment at import time.
 
     # Perform startup connection tests (logging to stderr)
     # These tests are for informative purposes and won't stop the DXT from running.
     perform_startup_connection_tests()
 
+    # Fill the connection pools in the background so the server starts accepting requests right away.
+    threading.Thread(target=warm_connection_pools, name="mssql-dxt-pool-warmup", daemon=True).start()
+    # Close idle connections and forget unused database-override pools in the background.
+    threading.Thread(target=_sweep_pools_periodically, name="mssql-dxt-pool-sweeper", daemon=True).start()
+
     try:
         mcp.run()
     except Exception as e:
-        print(json.dumps({"status": "critical_error", "message": f"Server critical failure: {e}"}), file=sys.stdout) # Log to stdout for MCP
+        print(_dumps({"status": "critical_error", "message": f"Server critical failure: {e}"}), file=sys.stdout) # Log to stdout for MCP
         sys.exit(1)
@@ -0,0 +1,516 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the connection pool and query paths in main.py, run against an in-memory stand-in
+for pyodbc (and for FastMCP when the mcp package is not installed):
+
+    python -m unittest test_main
+"""
+
+import os
+import io
+import json
+import sys
+import uuid
+import decimal
+import datetime
+import time
+import types
+import asyncio
+import threading
+import unittest
+import contextlib
+import unittest.mock
+
+
+class _FakeError(Exception):
+    pass
+
+
+class _FakeProgrammingError(_FakeError):
+    pass
+
+
+_WIDGETS_COLUMNS = [("id", "int", -1, "NO"), ("name", "nvarchar", 50, "YES")]
+
+
+def _default_responder(conn, sql, params):
+    """Returns (columns, rows) for one statement of a batch, or None for statements without a result set."""
+    if "sys.databases" in sql:
+        return ["name"], [("appdb",), ("master",)]
+    if "INFORMATION_SCHEMA.COLUMNS" in sql:
+        rows = _WIDGETS_COLUMNS if list(params) == ["widgets", "dbo"] else []
+        return ["COLUMN_NAME", "DATA_TYPE", "LENGTH", "IS_NULLABLE"], rows
+    if "INFORMATION_SCHEMA.TABLES" in sql:
+        return ["TABLE_SCHEMA", "TABLE_NAME"], [("dbo", f"t_in_{conn.database}")] + _fake_pyodbc.created_tables
+    if "@@SERVERNAME" in sql:
+        return ["name"], [("SRV1",)]
+    if "SELECT 1" in sql:
+        return ["x"], [(1,)]
+    if "FROM big" in sql:
+        return ["n"], [(i,) for i in range(100000)]
+    return None
+
+
+class _FakeCursor:
+    """
+    Models one ODBC statement. A batch is split on ';' and yields one result set per statement that
+    returns rows. Like SQL Server without MARS, only one statement may have pending results.
+    """
+
+    def __init__(self, conn):
+        self._conn = conn
+        self._rows = []
+        self._pending_sets = []
+        self.description = None
+        self.rowcount = -1
+        self.arraysize = 1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _clear(self):
+        self._rows = []
+        self._pending_sets = []
+        if self._conn.busy_cursor is self:
+            self._conn.busy_cursor = None
+
+    def _load(self, result):
+        columns, rows = result
+        self.description = [(column, None) for column in columns]
+        self._rows = list(rows)
+
+    def execute(self, sql, *params):
+        if self._conn.closed:
+            raise _FakeError("Connection is closed")
+        if self._conn.busy_cursor not in (None, self):
+            raise _FakeError("Connection is busy with results for another hstmt")
+        self._clear()
+        results = []
+        params = list(params)
+        for statement in filter(None, (part.strip() for part in sql.split(";"))):
+            statement_params, params = params[:statement.count("?")], params[statement.count("?"):]
+            if statement.startswith("USE "):
+                self._conn.database = statement[4:].strip()
+            if statement.startswith("CREATE TABLE "):
+                _fake_pyodbc.created_tables.append(tuple(statement.split()[2].split(".")))
+            result = _fake_pyodbc.responder(self._conn, statement, statement_params)
+            if result is not None:
+                results.append(result)
+        if not results:
+            self.description = None
+            self.rowcount = 1
+        else:
+            self._load(results[0])
+            self._pending_sets = results[1:]
+            self._conn.busy_cursor = self
+        return self
+
+    def fetchmany(self, size=None):
+        if self.description is None:
+            raise _FakeProgrammingError("No results.  Previous SQL was not a query.")
+        size = size or self.arraysize
+        chunk, self._rows = self._rows[:size], self._rows[size:]
+        self._conn.rows_fetched += len(chunk)
+        if len(chunk) < size and not self._pending_sets: # Reached the end of the last result set
+            self._clear()
+        return chunk
+
+    def fetchall(self):
+        return self.fetchmany(len(self._rows) + 1)
+
+    def fetchone(self):
+        chunk = self.fetchmany(1)
+        return chunk[0] if chunk else None
+
+    def fetchval(self):
+        row = self.fetchone()
+        return row[0] if row else None
+
+    def nextset(self):
+        if not self._pending_sets:
+            self._clear()
+            return False
+        self._load(self._pending_sets.pop(0))
+        return True
+
+    def cancel(self):
+        self._clear()
+
+    def close(self):
+        self._clear()
+
+
+class _FakeConnection:
+    def __init__(self, connection_string):
+        self.connection_string = connection_string
+        self.database = connection_string.split("DATABASE={", 1)[1].split("}", 1)[0]
+        self.autocommit = False
+        self.closed = False
+        self.busy_cursor = None
+        self.rows_fetched = 0
+        self.fail_commit = False
+        self.commits = 0
+
+    def cursor(self):
+        return _FakeCursor(self)
+
+    def commit(self):
+        if self.fail_commit:
+            raise _FakeError("The transaction log for database is full")
+        self.commits += 1
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+def _fake_connect(connection_string, **kwargs):
+    conn = _FakeConnection(connection_string)
+    _fake_pyodbc.connections.append(conn)
+    return conn
+
+
+_fake_pyodbc = types.ModuleType("pyodbc")
+_fake_pyodbc.Error = _FakeError
+_fake_pyodbc.ProgrammingError = _FakeProgrammingError
+_fake_pyodbc.Row = tuple
+_fake_pyodbc.pooling = False
+_fake_pyodbc.connect = _fake_connect
+_fake_pyodbc.connections = []
+_fake_pyodbc.created_tables = [] # Shared by all connections, like the server's catalog
+_fake_pyodbc.responder = _default_responder
+sys.modules["pyodbc"] = _fake_pyodbc
+
+try:
+    import mcp.server.fastmcp # noqa: F401
+except ImportError:
+    class _FakeFastMCP:
+        def __init__(self, name):
+            self.name = name
+
+        def tool(self):
+            return lambda fn: fn
+
+        def run(self):
+            pass
+
+    for _name in ("mcp", "mcp.server", "mcp.server.fastmcp"):
+        sys.modules[_name] = types.ModuleType(_name)
+    sys.modules["mcp.server.fastmcp"].FastMCP = _FakeFastMCP
+
+os.environ.update({
+    "APP_CONN1_ENABLE": "true",
+    "APP_CONN1_NAME": "c1",
+    "APP_CONN1_SERVER": "sqlhost",
+    "APP_CONN1_DATABASE": "appdb",
+    "APP_CONN1_USERNAME": "user",
+    "APP_CONN1_PASSWORD": "secret",
+})
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import main # noqa: E402
+
+
+class _PoolTestCase(unittest.TestCase):
+    def setUp(self):
+        _fake_pyodbc.connections.clear()
+        _fake_pyodbc.created_tables.clear()
+        _fake_pyodbc.responder = _default_responder
+        main._POOLS.clear()
+        main._CONNECTION_STRINGS.clear()
+        main._SCHEMA_CACHE.clear()
+        main._SCHEMA_CACHE_GENERATIONS.clear()
+
+    def _new_pool(self, min_size=0, max_size=2, idle_seconds=300):
+        return main.ConnectionPool("DRIVER={x};DATABASE={appdb}", "sqlhost", min_size, max_size, idle_seconds)
+
+
+class ConnectionPoolTests(_PoolTestCase):
+    def test_connection_is_reused(self):
+        pool = self._new_pool()
+        with pool.connection() as first:
+            pass
+        with pool.connection() as second:
+            pass
+        self.assertIs(first, second)
+        self.assertEqual(len(_fake_pyodbc.connections), 1)
+
+    def test_checkout_waits_for_a_connection_to_be_returned(self):
+        pool = self._new_pool(max_size=1)
+        acquired = []
+        with pool.connection() as held:
+            waiter = threading.Thread(target=lambda: acquired.append(pool._checkout()))
+            waiter.start()
+            time.sleep(0.1)
+            self.assertEqual(acquired, [])
+        waiter.join(2)
+        self.assertEqual(acquired, [held])
+        self.assertEqual(len(_fake_pyodbc.connections), 1)
+
+    def test_checkout_times_out_when_pool_is_exhausted(self):
+        pool = self._new_pool(max_size=1)
+        timeout, main.CONNECT_TIMEOUT_SECONDS = main.CONNECT_TIMEOUT_SECONDS, 0.1
+        try:
+            with pool.connection():
+                with self.assertRaisesRegex(ConnectionError, "exhausted"):
+                    pool._checkout()
+        finally:
+            main.CONNECT_TIMEOUT_SECONDS = timeout
+
+    def test_unshared_checkout_leaves_idle_connections_alone(self):
+        pool = self._new_pool(max_size=3)
+        pool.warm(2)
+        warmed = list(_fake_pyodbc.connections)
+        with pool.connection(reuse=False) as conn:
+            self.assertNotIn(conn._connection, warmed)
+        self.assertTrue(conn.closed)
+        self.assertEqual([entry[0]._connection for entry in pool._idle], warmed)
+        self.assertFalse(any(c.closed for c in warmed))
+
+    def test_unshared_checkout_makes_room_in_a_full_pool(self):
+        pool = self._new_pool(max_size=2)
+        pool.warm(2)
+        oldest, newest = _fake_pyodbc.connections
+        with pool.connection(reuse=False):
+            self.assertTrue(oldest.closed)
+        self.assertEqual([entry[0]._connection for entry in pool._idle], [newest])
+
+    def test_idle_connections_are_pruned_down_to_min_size(self):
+        pool = self._new_pool(min_size=1, idle_seconds=0)
+        pool.warm(2)
+        time.sleep(0.01)
+        pool.prune()
+        self.assertEqual(len(pool._idle), 1)
+        self.assertEqual(sum(conn.closed for conn in _fake_pyodbc.connections), 1)
+
+    def test_database_override_pools_are_swept(self):
+        details = main._get_connection_details_by_name("c1")
+        idle_seconds, main.POOL_IDLE_SECONDS = main.POOL_IDLE_SECONDS, 0
+        try:
+            main._pool_for_details(details).warm(1)
+            for i in range(5):
+                with main._pool_for_details(details, f"db{i}").connection(autocommit=True):
+                    pass
+            time.sleep(0.01)
+            main._pool_for_details(details) # A lookup leaves the other pools to the sweeper
+            self.assertFalse(any(conn.closed for conn in _fake_pyodbc.connections))
+            main._sweep_pools()
+        finally:
+            main.POOL_IDLE_SECONDS = idle_seconds
+        self.assertTrue(all(conn.closed for conn in _fake_pyodbc.connections[1:]))
+        self.assertFalse(_fake_pyodbc.connections[0].closed) # The default database's pool keeps min_size
+        self.assertEqual(list(main._POOLS), [details["connection_string"]])
+        self.assertEqual(main._CONNECTION_STRINGS, {})
+
+    def test_busy_override_pools_are_kept(self):
+        details = main._get_connection_details_by_name("c1")
+        pool = main._pool_for_details(details, "otherdb")
+        with pool.connection():
+            main._sweep_pools()
+        self.assertIs(main._pool_for_details(details, "otherdb"), pool)
+        self.assertEqual(len(pool._idle), 1)
+
+    def test_retired_pool_closes_returned_connections(self):
+        pool = self._new_pool()
+        with pool.connection() as conn:
+            with pool._cond:
+                pool._retired = True # As if swept while this checkout was starting
+        self.assertTrue(conn.closed)
+        self.assertEqual(len(pool._idle), 0)
+
+    def test_commit_failure_is_raised_and_connection_discarded(self):
+        pool = self._new_pool()
+        with self.assertRaisesRegex(_FakeError, "log for database is full"):
+            with pool.connection() as conn:
+                conn.fail_commit = True
+        self.assertTrue(conn.closed)
+        self.assertEqual(len(pool._idle), 0)
+        self.assertEqual(pool._checked_out, 0)
+
+    def test_statement_cursor_results_are_drained_on_checkin(self):
+        pool = self._new_pool()
+        with pool.connection(autocommit=True) as conn:
+            conn.statement_cursor("SELECT n FROM big").execute("SELECT n FROM big").fetchmany(10) # Read cut short
+        with pool.connection(autocommit=True) as reused:
+            self.assertIs(reused, conn)
+            with reused.cursor() as cursor:
+                self.assertEqual(cursor.execute("SELECT 1").fetchval(), 1)
+
+    def test_unused_statement_cursors_are_not_touched_on_checkin(self):
+        def fail():
+            raise _FakeError("Function sequence error")
+
+        pool = self._new_pool()
+        with pool.connection(autocommit=True) as conn:
+            conn.statement_cursor("SELECT 1").execute("SELECT 1").fetchall()
+        conn._statement_cursors["SELECT 1"].nextset = fail # Would discard the connection if called
+        with pool.connection(autocommit=True):
+            pass
+        with pool.connection(autocommit=True) as reused:
+            self.assertIs(reused, conn)
+
+    def test_startup_probe_leaves_no_statement_cursor_behind(self):
+        details = main._get_connection_details_by_name("c1")
+        self.assertIn("Server: SRV1", main._test_connection(details))
+        conn = main._pool_for_details(details)._idle[-1][0]
+        self.assertEqual(conn._statement_cursors, {})
+        self.assertIsNone(conn.busy_cursor)
+
+
+class ToolTests(_PoolTestCase):
+    def test_execute_query_session_state_does_not_leak(self):
+        asyncio.run(main.execute_query("c1", "USE master"))
+        response = asyncio.run(main.list_tables("c1"))
+        self.assertIn('"dbo.t_in_appdb"', response)
+        self.assertNotIn("master", response)
+
+    def test_execute_query_keeps_warmed_connections_pooled(self):
+        pool = main._pool_for_details(main._get_connection_details_by_name("c1"))
+        pool.warm(2)
+        warmed = list(_fake_pyodbc.connections)
+        asyncio.run(main.execute_query("c1", "SELECT 1"))
+        self.assertEqual(len(pool._idle), 2)
+        self.assertFalse(any(c.closed for c in warmed))
+        self.assertTrue(_fake_pyodbc.connections[-1].closed)
+
+    def test_row_cap_bounds_rows_fetched_from_driver(self):
+        max_rows, main.MAX_ROWS = main.MAX_ROWS, 100
+        try:
+            response = asyncio.run(main.execute_query("c1", "SELECT n FROM big", batch_size=10**9))
+        finally:
+            main.MAX_ROWS = max_rows
+        self.assertTrue(json.loads(response)["truncated"])
+        self.assertLessEqual(_fake_pyodbc.connections[-1].rows_fetched, 101)
+
+    def test_max_rows_bounds_rows_fetched_from_driver(self):
+        response = asyncio.run(main.execute_query("c1", "SELECT n FROM big", max_rows=5))
+        self.assertEqual(json.loads(response)["rows"], [[0], [1], [2], [3], [4]])
+        self.assertLessEqual(_fake_pyodbc.connections[-1].rows_fetched, 6)
+
+    def test_column_major_groups_values_per_column(self):
+        _fake_pyodbc.responder = lambda conn, sql, params: (["id", "name"], [(1, "a"), (2, "b"), (3, "c")])
+        response = json.loads(asyncio.run(main.execute_query("c1", "SELECT id, name FROM t", column_major=True)))
+        self.assertEqual(response["columns"], ["id", "name"])
+        self.assertEqual(response["data"], [[1, 2, 3], ["a", "b", "c"]])
+        self.assertNotIn("rows", response)
+        self.assertNotIn("truncated", response)
+
+    def test_column_major_reports_truncation(self):
+        response = json.loads(asyncio.run(main.execute_query("c1", "SELECT n FROM big", column_major=True, max_rows=3)))
+        self.assertEqual(response["data"], [[0, 1, 2]])
+        self.assertTrue(response["truncated"])
+
+    def test_execute_query_invalidates_cached_metadata(self):
+        self.assertNotIn("new_t", asyncio.run(main.list_tables("c1")))
+        asyncio.run(main.execute_query("c1", "CREATE TABLE dbo.new_t (id int)"))
+        self.assertIn("dbo.new_t", asyncio.run(main.list_tables("c1")))
+
+    def test_catalog_bootstrap_reads_each_result_set(self):
+        response = json.loads(asyncio.run(main.get_catalog_bootstrap("c1")))
+        self.assertEqual(response["databases"], ["appdb", "master"])
+        self.assertEqual(response["tables"], ["dbo.t_in_appdb"])
+        self.assertNotIn("schema", response)
+        self.assertEqual(json.loads(asyncio.run(main.list_databases("c1")))["databases"], ["appdb", "master"])
+        self.assertEqual(len(_fake_pyodbc.connections), 1) # The connection was left ready for reuse
+
+    def test_catalog_bootstrap_includes_table_schema(self):
+        response = json.loads(asyncio.run(main.get_catalog_bootstrap("c1", table_name="widgets")))
+        self.assertEqual(response["tables"], ["dbo.t_in_appdb"])
+        self.assertEqual([column["column_name"] for column in response["schema"]], ["id", "name"])
+        self.assertEqual(response["schema"][1]["max_length"], 50)
+
+    def test_list_tables_on_connections_reports_each_connection(self):
+        response = json.loads(asyncio.run(main.list_tables_on_connections(["c1", "zz", "c1"])))
+        self.assertEqual(list(response["results"]), ["c1", "zz"])
+        self.assertEqual(response["results"]["c1"]["tables"], ["dbo.t_in_appdb"])
+        self.assertEqual(response["results"]["zz"]["status"], "error")
+
+    def test_list_tables_on_connections_defaults_to_all_connections(self):
+        response = json.loads(asyncio.run(main.list_tables_on_connections(database_name="otherdb")))
+        self.assertEqual(response["results"], {"c1": {"connection_name": "c1", "database_name": "otherdb", "tables": ["dbo.t_in_otherdb"]}})
+
+    def test_unknown_connection_names_are_not_tracked(self):
+        asyncio.run(main.execute_query("nope", "SELECT 1"))
+        asyncio.run(main.list_tables_on_connections(["zz"]))
+        self.assertEqual(main._SCHEMA_CACHE_GENERATIONS, {})
+
+    def test_table_not_found_keeps_cached_metadata(self):
+        asyncio.run(main.list_tables("c1"))
+        _fake_pyodbc.created_tables.append(("dbo", "new_t"))
+        response = json.loads(asyncio.run(main.get_table_schema("c1", "missing")))
+        self.assertEqual(response["status"], "error")
+        self.assertNotIn("dbo.new_t", asyncio.run(main.list_tables("c1")))
+
+    def test_database_error_drops_cached_metadata(self):
+        def failing_responder(conn, sql, params):
+            if "INFORMATION_SCHEMA.COLUMNS" in sql:
+                raise _FakeError("Invalid object name")
+            return _default_responder(conn, sql, params)
+
+        asyncio.run(main.list_tables("c1"))
+        _fake_pyodbc.created_tables.append(("dbo", "new_t"))
+        _fake_pyodbc.responder = failing_responder
+        self.assertIn("Invalid object name", asyncio.run(main.get_table_schema("c1", "t")))
+        self.assertIn("dbo.new_t", asyncio.run(main.list_tables("c1")))
+
+
+
+class EncodingTests(unittest.TestCase):
+    def test_column_values_are_encoded(self):
+        values = [
+            decimal.Decimal("12345678901234567890.10"),
+            b"\x00\xff",
+            datetime.date(2024, 1, 2),
+            datetime.datetime(2024, 1, 2, 3, 4, 5),
+            datetime.time(3, 4, 5),
+            uuid.UUID(int=1),
+        ]
+        self.assertEqual(json.loads(main._dumps(values)), [
+            "12345678901234567890.10",
+            "AP8=",
+            "2024-01-02",
+            "2024-01-02T03:04:05",
+            "03:04:05",
+            "00000000-0000-0000-0000-000000000001",
+        ])
+
+    def test_unknown_types_are_rejected(self):
+        with self.assertRaises(TypeError):
+            main._json_default(object())
+
+
+class ConnectionStringTests(unittest.TestCase):
+    def test_values_are_braced_and_escaped(self):
+        self.assertEqual(main._quote_odbc_value("p;w}d{"), "{p;w}}d{}")
+
+    def test_credentials_and_database_cannot_inject_attributes(self):
+        connection_string = main._build_connection_string(
+            "sqlhost", "1433", "db}x", "sql_server_authentication", "ODBC Driver 18 for SQL Server",
+            "user", "pw;Encrypt=no}"
+        )
+        self.assertIn("DATABASE={db}}x};", connection_string)
+        self.assertIn("PWD={pw;Encrypt=no}}};", connection_string)
+
+
+class LoadConnectionsTests(unittest.TestCase):
+    def test_unsupported_auth_method_is_skipped(self):
+        env = {
+            "APP_CONN2_ENABLE": "true",
+            "APP_CONN2_NAME": "c2",
+            "APP_CONN2_SERVER": "sqlhost",
+            "APP_CONN2_DATABASE": "appdb",
+            "APP_CONN2_AUTH_METHOD": "azure_ad_authentication",
+        }
+        stderr = io.StringIO()
+        with unittest.mock.patch.dict(os.environ, env), contextlib.redirect_stderr(stderr):
+            connections = main.load_connections_from_env()["connections"]
+        self.assertEqual([c["name"] for c in connections], ["c1"])
+        self.assertIn("unsupported authentication method 'azure_ad_authentication'", stderr.getvalue())
+
+if __name__ == "__main__":
+    unittest.main()